@@ -18,25 +18,26 @@ This API defines two customizable methods for the pytorch model:
 NOTE:
     1: There's a difference between predictor type and model type. model type
         refers to predefined deployable format such as caffe2, torchscript(_int8),
-        while the predictor type can be anything that "export_predictor" can
-        recognize.
+        torchscript_fp16/bf16, while the predictor type can be anything that
+        "export_predictor" can recognize.
     2: The standard model exporting methods are provided by the library code, they're
         meant to be modularized and can be used by customized export_predictor as well.
 """
 
+import contextlib
+import copy
+import gc
 import json
 import logging
 import os
-from typing import Callable, Dict, NamedTuple, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Union
 
 import torch
 import torch.nn as nn
-import torch.quantization.quantize_fx
-from d2go.export.torchscript import (
-    trace_and_save_torchscript,
-    MobileOptimizationConfig,
-)
-from d2go.modeling.quantization import post_training_quantize
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 from detectron2.utils.file_io import PathManager
 from mobile_cv.arch.utils import fuse_utils
 from mobile_cv.common.misc.registry import Registry
@@ -47,11 +48,17 @@ from mobile_cv.predictor.builtin_functions import (
     NaiveRunFunc,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
 
-class PredictorExportConfig(NamedTuple):
+@dataclass(frozen=True)
+class PredictorExportConfig(object):
     """
     Storing information for exporting a predictor.
 
@@ -63,7 +70,9 @@ class PredictorExportConfig(NamedTuple):
         data_generator (Callable): a function to generate all data needed for tracing,
             such that data = data_generator(x), the returned data has the same nested
             structure as model. The data for each model will be treated as positional
-            arguments, i.e. model(*data).
+            arguments, i.e. model(*data). When multiple sub-models take the same
+            tensor, the generator should return the same tensor object (or views of
+            it) for each of them instead of copies, to avoid duplicating memory.
         model_export_kwargs (Dict): additional kwargs when exporting each sub-model, it
             follows the same nested structure as the model, and may contains information
             such as scriptable.
@@ -71,6 +80,13 @@ class PredictorExportConfig(NamedTuple):
         preprocess_info (FuncInfo): info for predictor's preprocess
         postprocess_info (FuncInfo): info for predictor's postprocess
         run_func_info (FuncInfo): info for predictor's run_fun
+
+        data_generator_required (bool): whether the model export methods need the
+            data from data_generator, set it to False when none of the sub-models
+            are exported via tracing (eg. scripting-only export methods) to skip
+            generating data.
+        parallel_export (bool): export sub-models concurrently in a thread pool, this
+            requires the model export methods of all sub-models to be thread-safe.
     """
 
     model: Union[nn.Module, Dict[str, nn.Module]]
@@ -78,13 +94,27 @@ class PredictorExportConfig(NamedTuple):
     model_export_method: Optional[Union[str, Dict[str, str]]] = None
     model_export_kwargs: Optional[Union[Dict, Dict[str, Dict]]] = None
 
-    preprocess_info: FuncInfo = FuncInfo.gen_func_info(IdentityPreprocess, params={})
-    postprocess_info: FuncInfo = FuncInfo.gen_func_info(IdentityPostprocess, params={})
-    run_func_info: FuncInfo = FuncInfo.gen_func_info(NaiveRunFunc, params={})
+    preprocess_info: FuncInfo = field(
+        default_factory=lambda: FuncInfo.gen_func_info(IdentityPreprocess, params={})
+    )
+    postprocess_info: FuncInfo = field(
+        default_factory=lambda: FuncInfo.gen_func_info(IdentityPostprocess, params={})
+    )
+    run_func_info: FuncInfo = field(
+        default_factory=lambda: FuncInfo.gen_func_info(NaiveRunFunc, params={})
+    )
+
+    data_generator_required: bool = True
+    parallel_export: bool = False
 
 
 def convert_and_export_predictor(
-    cfg, pytorch_model, predictor_type, output_dir, data_loader
+    cfg,
+    pytorch_model,
+    predictor_type,
+    output_dir,
+    data_loader,
+    preserve_input_model=False,
 ):
     """
     Entry point for convert and export model. This involves two steps:
@@ -92,37 +122,192 @@ def convert_and_export_predictor(
             mainly for quantizing the model.
         - export: exporting the converted `pytorch_model` to predictor. This step
             should not alter the behaviour of model.
+
+    NOTE: the given `pytorch_model` may be modified in-place during conversion, set
+    `preserve_input_model` to True to convert a copy of it instead.
     """
     if "int8" in predictor_type:
-        if not cfg.QUANTIZATION.QAT.ENABLED:
-            logger.info(
-                "The model is not quantized during training, running post"
-                " training quantization ..."
+        # quantized ops are dispatched according to the global quantized engine, pin
+        # it to the configured backend for converting, exporting and later running.
+        with _quantized_engine(cfg.QUANTIZATION.BACKEND):
+            pytorch_model = _convert_quantized_model(
+                cfg, pytorch_model, data_loader, preserve_input_model
+            )
+            return export_predictor(
+                cfg, pytorch_model, predictor_type, output_dir, data_loader
             )
-            pytorch_model = post_training_quantize(cfg, pytorch_model, data_loader)
-            # only check bn exists in ptq as qat still has bn inside fused ops
-            assert not fuse_utils.check_bn_exist(pytorch_model)
-        logger.info(f"Converting quantized model {cfg.QUANTIZATION.BACKEND}...")
-        if cfg.QUANTIZATION.EAGER_MODE:
-            # TODO(future diff): move this logic to prepare_for_quant_convert
-            pytorch_model = torch.quantization.convert(pytorch_model, inplace=False)
-        else:  # FX graph mode quantization
-            if hasattr(pytorch_model, "prepare_for_quant_convert"):
-                pytorch_model = pytorch_model.prepare_for_quant_convert(cfg)
-            else:
-                # TODO(future diff): move this to a default function
-                pytorch_model = torch.quantization.quantize_fx.convert_fx(pytorch_model)
-
-        logger.info("Quantized Model:\n{}".format(pytorch_model))
     else:
         pytorch_model = fuse_utils.fuse_model(pytorch_model)
-        logger.info("Fused Model:\n{}".format(pytorch_model))
-        if fuse_utils.count_bn_exist(pytorch_model) > 0:
-            logger.warning("BN existed in pytorch model after fusing.")
+        logger.info("Fused Model:\n%s", pytorch_model)
+        bn_exist, bn_count = _bn_summary(pytorch_model)
+        if bn_exist:
+            bn_count -= _force_fuse_residual_bn(pytorch_model)
+            if bn_count > 0:
+                logger.warning(f"{bn_count} BN existed in pytorch model after fusing.")
 
     return export_predictor(cfg, pytorch_model, predictor_type, output_dir, data_loader)
 
 
+def _bn_summary(model):
+    """
+    Returns whether BN exists in the model and the number of BN, the module tree is only
+    traversed once. BN is checked in the same way as `fuse_utils.check_bn_exist`.
+    """
+    bn_count = sum(isinstance(m, nn.BatchNorm2d) for m in model.modules())
+    return bn_count > 0, bn_count
+
+
+@contextlib.contextmanager
+def _quantized_engine(backend):
+    """
+    Pin the global quantized engine to the given backend. Like the prepare_for_quant
+    functions (which set the engine globally), the engine is kept after exporting, so
+    that the exported int8 predictor runs on the same backend if it's loaded later in
+    the same process. The previous engine is only restored if exporting fails.
+    """
+    assert backend in torch.backends.quantized.supported_engines, (
+        f"Quantized engine {backend} is not supported, supported engines:"
+        f" {torch.backends.quantized.supported_engines}"
+    )
+    prev_engine = torch.backends.quantized.engine
+    torch.backends.quantized.engine = backend
+    logger.info(f"Using quantized engine: {backend}")
+    try:
+        yield
+    except Exception:
+        torch.backends.quantized.engine = prev_engine
+        raise
+
+
+def _convert_quantized_model(cfg, pytorch_model, data_loader, preserve_input_model):
+    if not cfg.QUANTIZATION.QAT.ENABLED:
+        from d2go.modeling.quantization import post_training_quantize
+
+        logger.info(
+            "The model is not quantized during training, running post"
+            " training quantization ..."
+        )
+        pytorch_model = post_training_quantize(cfg, pytorch_model, data_loader)
+        # only check bn exists in ptq as qat still has bn inside fused ops
+        bn_exist, _ = _bn_summary(pytorch_model)
+        assert not bn_exist
+    logger.info(f"Converting quantized model {cfg.QUANTIZATION.BACKEND}...")
+    if cfg.QUANTIZATION.EAGER_MODE:
+        # TODO(future diff): move this logic to prepare_for_quant_convert
+        pytorch_model = torch.quantization.convert(
+            pytorch_model, inplace=not preserve_input_model
+        )
+    else:  # FX graph mode quantization
+        prepared_model = pytorch_model
+        if hasattr(prepared_model, "prepare_for_quant_convert"):
+            pytorch_model = prepared_model.prepare_for_quant_convert(cfg)
+        else:
+            # TODO(future diff): move this to a default function
+            from torch.quantization.quantize_fx import convert_fx
+
+            pytorch_model = convert_fx(prepared_model)
+        del prepared_model
+        if not cfg.QUANTIZATION.QAT.ENABLED:
+            # the prepared model is a copy made by post_training_quantize, it's only
+            # kept alive by the reference cycle between GraphModule and its graph, free
+            # its float parameters and observers before exporting.
+            gc.collect()
+        _audit_quant_graph(pytorch_model, strict=cfg.QUANTIZATION.STRICT_QDQ_AUDIT)
+
+    logger.info("Quantized Model:\n%s", pytorch_model)
+    return pytorch_model
+
+
+def _is_quantize_node(node):
+    return node.op == "call_function" and node.target in (
+        torch.quantize_per_tensor,
+        torch.quantize_per_channel,
+    )
+
+
+def _is_dequantize_node(node):
+    return (node.op == "call_method" and node.target == "dequantize") or (
+        node.op == "call_function" and node.target == torch.dequantize
+    )
+
+
+def _audit_quant_graph(model, strict=False):
+    """
+    Check the Q/DQ placement of the FX graph mode converted model. Ideally the graph is
+    quantized once at the input and dequantized at the output, each dequantize followed
+    by quantize in the middle of the graph (either directly, or with float ops between
+    them) introduces extra memory traffic and can make the int8 model slower than the
+    float one.
+    """
+    violations = []
+    for module_name, module in model.named_modules():
+        if not isinstance(module, torch.fx.GraphModule):
+            continue
+        for node in module.graph.nodes:
+            if node.op not in ("call_module", "call_function", "call_method"):
+                continue
+            if _is_dequantize_node(node) or _is_quantize_node(node):
+                continue
+            input_nodes = node.all_input_nodes
+            if (
+                len(input_nodes) > 0
+                and len(node.users) > 0
+                and all(_is_dequantize_node(x) for x in input_nodes)
+                and all(_is_quantize_node(x) for x in node.users)
+            ):
+                violations.append(f"{module_name}:{node.name} ({node.target})")
+        for node in module.graph.nodes:
+            if (
+                _is_quantize_node(node)
+                and isinstance(node.args[0], torch.fx.Node)
+                and _is_dequantize_node(node.args[0])
+            ):
+                violations.append(f"{module_name}:{node.name} (dequantize->quantize)")
+
+    if len(violations) > 0:
+        msg = (
+            "Found {} node(s) running in float between dequantize and quantize in"
+            " the quantized model, consider quantizing them:\n{}".format(
+                len(violations), "\n".join(violations)
+            )
+        )
+        if strict:
+            raise RuntimeError(msg)
+        logger.warning(msg)
+    return violations
+
+
+def _force_fuse_residual_bn(model):
+    """
+    Fold the BN left over by `fuse_utils.fuse_model` into the preceding conv, this only
+    handles the Conv2d -> BatchNorm2d pairs in eval mode that are adjacent children of
+    a plain nn.Sequential. The BN is replaced by nn.Identity in-place. Returns the
+    number of folded BN.
+    """
+    num_fused = 0
+    for module in model.modules():
+        # subclasses of Sequential may have custom forward where adjacent children
+        # are not chained
+        if type(module) is not nn.Sequential:
+            continue
+        names = list(module._modules.keys())
+        for conv_name, bn_name in zip(names[:-1], names[1:]):
+            conv, bn = module._modules[conv_name], module._modules[bn_name]
+            if (
+                type(conv) == nn.Conv2d
+                and type(bn) == nn.BatchNorm2d
+                and not conv.training
+                and not bn.training
+                and bn.track_running_stats
+                and bn.num_features == conv.out_channels
+            ):
+                logger.info(f"Fusing residual BN {bn_name} into conv {conv_name}")
+                module._modules[conv_name] = fuse_conv_bn_eval(conv, bn)
+                module._modules[bn_name] = nn.Identity()
+                num_fused += 1
+    return num_fused
+
+
 def export_predictor(cfg, pytorch_model, predictor_type, output_dir, data_loader):
     """
     Interface for exporting a pytorch model to predictor of given type. This function
@@ -155,26 +340,104 @@ def export_predictor(cfg, pytorch_model, predictor_type, output_dir, data_loader
 
 
 def _export_single_model(
-    predictor_path,
+    model_rel_path,
     model,
     input_args,
     save_path,
-    model_export_method,
+    model_export_method_cls,
     model_export_kwargs,
     predictor_type,  # TODO: remove this after refactoring ModelInfo
 ):
     assert isinstance(model, nn.Module), model
-    load_kwargs = ModelExportMethodRegistry.get(model_export_method).export(
+    load_kwargs = model_export_method_cls.export(
         model=model,
         input_args=input_args,
         save_path=save_path,
         **model_export_kwargs,
     )
     assert isinstance(load_kwargs, dict)  # TODO: save this in predictor_info
-    model_rel_path = os.path.relpath(save_path, predictor_path)
     return ModelInfo(path=model_rel_path, type=predictor_type)
 
 
+def _get_first_batch(data_loader):
+    # iterating a multi-process DataLoader spawns all the workers just to draw one
+    # batch, load the samples of the first batch in main process directly instead.
+    # NOTE: worker_init_fn isn't called in this case, the dataset shouldn't rely on
+    # it for producing the samples.
+    if (
+        isinstance(data_loader, torch.utils.data.DataLoader)
+        and data_loader.num_workers > 0
+        and data_loader.batch_sampler is not None
+        and not isinstance(data_loader.dataset, torch.utils.data.IterableDataset)
+    ):
+        indices = next(iter(data_loader.batch_sampler))
+        return data_loader.collate_fn([data_loader.dataset[i] for i in indices])
+    return next(iter(data_loader))
+
+
+def _log_shared_inputs(model_inputs):
+    # report how much of the sub-models' inputs share the same storage, tensors
+    # duplicated by data_generator show up as extra unique bytes.
+    if not logger.isEnabledFor(logging.INFO):
+        return None
+    total_bytes = 0
+    unique_storages = {}
+    for inputs in model_inputs.values():
+        for x in inputs if isinstance(inputs, (list, tuple)) else [inputs]:
+            if isinstance(x, torch.Tensor):
+                nbytes = x.numel() * x.element_size()
+                total_bytes += nbytes
+                # untyped_storage is only available since torch 2.0
+                key = getattr(x, "untyped_storage", x.storage)().data_ptr()
+                unique_storages[key] = max(unique_storages.get(key, 0), nbytes)
+    unique_bytes = sum(unique_storages.values())
+    logger.info(
+        "Inputs of sub-models take {} bytes, {} bytes after de-duplicating shared"
+        " storages".format(total_bytes, unique_bytes)
+    )
+    return total_bytes, unique_bytes
+
+
+def _save_predictor_info(predictor_info, json_path):
+    # local files don't need to be dispatched through the PathManager handlers
+    open_func = open if "://" not in json_path else PathManager.open
+    predictor_info_dict = predictor_info.to_dict()
+    # orjson is much faster than the pure python pretty-printing of json, use it
+    # when available and fall back to json for the data orjson can't serialize.
+    if orjson is not None:
+        try:
+            data = orjson.dumps(
+                predictor_info_dict,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError as e:
+            logger.info(f"Can't serialize predictor info with orjson ({e}), using json")
+        else:
+            with open_func(json_path, "wb") as f:
+                f.write(data)
+            return
+
+    # use the same indentation as orjson.OPT_INDENT_2, so the file doesn't depend on
+    # whether orjson is installed
+    with open_func(json_path, "w") as f:
+        json.dump(predictor_info_dict, f, indent=2)
+
+
+def _export_models_in_parallel(export_kwargs):
+    # create all sub-directories upfront to avoid racing between export workers
+    for kwargs in export_kwargs.values():
+        PathManager.mkdirs(kwargs["save_path"])
+
+    max_workers = max(1, min(len(export_kwargs), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            name: executor.submit(_export_single_model, **kwargs)
+            for name, kwargs in export_kwargs.items()
+        }
+        # keep the order of sub-models, exception from any worker is re-raised here
+        return {name: future.result() for name, future in futures.items()}
+
+
 def default_export_predictor(
     cfg, pytorch_model, predictor_type, output_dir, data_loader
 ):
@@ -182,11 +445,12 @@ def default_export_predictor(
     # calling "prepare_for_export". It'll export all sub models in standard way
     # according to the "predictor_type".
     assert hasattr(pytorch_model, "prepare_for_export"), pytorch_model
-    inputs = next(iter(data_loader))
+    inputs = _get_first_batch(data_loader)
     export_config = pytorch_model.prepare_for_export(cfg, inputs, predictor_type)
     model_inputs = (
         export_config.data_generator(inputs)
         if export_config.data_generator is not None
+        and export_config.data_generator_required
         else None
     )
 
@@ -200,15 +464,19 @@ def default_export_predictor(
     }
 
     if isinstance(export_config.model, dict):
-        models_info = {}
-        for name, model in export_config.model.items():
-            save_path = os.path.join(predictor_path, name)
-            model_info = _export_single_model(
-                predictor_path=predictor_path,
+        if model_inputs is not None:
+            missing = set(export_config.model) - set(model_inputs)
+            assert not missing, f"data_generator doesn't generate inputs for {missing}"
+            _log_shared_inputs(model_inputs)
+
+        base_path = os.path.join(predictor_path, "")
+        export_kwargs = {
+            name: dict(
+                model_rel_path=name,
                 model=model,
                 input_args=model_inputs[name] if model_inputs is not None else None,
-                save_path=save_path,
-                model_export_method=(
+                save_path=base_path + name,
+                model_export_method_cls=ModelExportMethodRegistry.get(
                     predictor_type
                     if export_config.model_export_method is None
                     else export_config.model_export_method[name]
@@ -220,16 +488,26 @@ def default_export_predictor(
                 ),
                 predictor_type=predictor_type,
             )
-            models_info[name] = model_info
+            for name, model in export_config.model.items()
+        }
+        if export_config.parallel_export:
+            models_info = _export_models_in_parallel(export_kwargs)
+        else:
+            models_info = {
+                name: _export_single_model(**kwargs)
+                for name, kwargs in export_kwargs.items()
+            }
         predictor_init_kwargs["models"] = models_info
     else:
         save_path = predictor_path  # for single model exported files are put under `predictor_path` together with predictor_info.json
         model_info = _export_single_model(
-            predictor_path=predictor_path,
+            model_rel_path=".",
             model=export_config.model,
             input_args=model_inputs,
             save_path=save_path,
-            model_export_method=export_config.model_export_method or predictor_type,
+            model_export_method_cls=ModelExportMethodRegistry.get(
+                export_config.model_export_method or predictor_type
+            ),
             model_export_kwargs=export_config.model_export_kwargs or {},
             predictor_type=predictor_type,
         )
@@ -237,16 +515,18 @@ def default_export_predictor(
 
     # assemble predictor
     predictor_info = PredictorInfo(**predictor_init_kwargs)
-    with PathManager.open(
-        os.path.join(predictor_path, "predictor_info.json"), "w"
-    ) as f:
-        json.dump(predictor_info.to_dict(), f, indent=4)
+    _save_predictor_info(
+        predictor_info, os.path.join(predictor_path, "predictor_info.json")
+    )
 
     return predictor_path
 
 
 ModelExportMethodRegistry = Registry("ModelExportMethod", allow_override=True)
 
+# caffe2 export runs nets in the global workspace, it can't be done concurrently.
+_CAFFE2_EXPORT_LOCK = threading.Lock()
+
 
 @ModelExportMethodRegistry.register("caffe2")
 class DefaultCaffe2Export(object):
@@ -254,7 +534,8 @@ class DefaultCaffe2Export(object):
     def export(cls, model, input_args, save_path, **export_kwargs):
         from d2go.export.caffe2 import export_caffe2
 
-        export_caffe2(model, input_args[0], save_path, **export_kwargs)
+        with _CAFFE2_EXPORT_LOCK:
+            export_caffe2(model, input_args[0], save_path, **export_kwargs)
         return {}
 
 
@@ -267,6 +548,8 @@ class DefaultCaffe2Export(object):
 class DefaultTorchscriptExport(object):
     @classmethod
     def export(cls, model, input_args, save_path, **export_kwargs):
+        from d2go.export.torchscript import trace_and_save_torchscript
+
         trace_and_save_torchscript(model, input_args, save_path, **export_kwargs)
         return {}
 
@@ -276,6 +559,11 @@ class DefaultTorchscriptExport(object):
 class DefaultTorchscriptMobileExport(object):
     @classmethod
     def export(cls, model, input_args, save_path, **export_kwargs):
+        from d2go.export.torchscript import (
+            MobileOptimizationConfig,
+            trace_and_save_torchscript,
+        )
+
         trace_and_save_torchscript(
             model,
             input_args,
@@ -284,3 +572,71 @@ class DefaultTorchscriptMobileExport(object):
             **export_kwargs,
         )
         return {}
+
+
+def _cast_floating_tensors(x, dtype):
+    if isinstance(x, torch.Tensor):
+        return x.to(dtype) if x.is_floating_point() else x
+    if isinstance(x, (list, tuple)):
+        return type(x)(_cast_floating_tensors(y, dtype) for y in x)
+    if isinstance(x, dict):
+        return {k: _cast_floating_tensors(v, dtype) for k, v in x.items()}
+    return x
+
+
+def _is_on_cpu(model, input_args):
+    tensors = list(model.parameters()) + list(model.buffers())
+    if len(tensors) == 0:
+        tensors = [x for x in input_args if isinstance(x, torch.Tensor)]
+    return any(x.device.type == "cpu" for x in tensors)
+
+
+class _CastInputsOutputsWrapper(nn.Module):
+    """
+    Runs the model in the given dtype while keeping FP32 interface, floating inputs are
+    cast to dtype and floating outputs are cast back to FP32.
+    """
+
+    def __init__(self, model, dtype):
+        super().__init__()
+        # cast a copy since the model (or its sub-modules) might be shared with other
+        # sub-models being exported concurrently in FP32, NOTE: this temporarily
+        # takes extra memory of the model in the given dtype during exporting.
+        self.model = copy.deepcopy(model).to(dtype)
+        self.dtype = dtype
+
+    def forward(self, *args):
+        outputs = self.model(*_cast_floating_tensors(args, self.dtype))
+        return _cast_floating_tensors(outputs, torch.float32)
+
+
+@ModelExportMethodRegistry.register("torchscript_fp16")
+@ModelExportMethodRegistry.register("torchscript_fp16@tracing")
+class DefaultTorchscriptFP16Export(object):
+    dtype = torch.float16
+    # half precision conv doesn't have CPU kernels, the model must run on GPU
+    supports_cpu = False
+
+    @classmethod
+    def export(cls, model, input_args, save_path, **export_kwargs):
+        from d2go.export.torchscript import trace_and_save_torchscript
+
+        if not cls.supports_cpu and _is_on_cpu(model, input_args):
+            raise ValueError(
+                f"Exporting model in {cls.dtype} requires the model and inputs on GPU,"
+                " use torchscript_bf16 for exporting model on CPU."
+            )
+        trace_and_save_torchscript(
+            _CastInputsOutputsWrapper(model, cls.dtype),
+            input_args,
+            save_path,
+            **export_kwargs,
+        )
+        return {}
+
+
+@ModelExportMethodRegistry.register("torchscript_bf16")
+@ModelExportMethodRegistry.register("torchscript_bf16@tracing")
+class DefaultTorchscriptBF16Export(DefaultTorchscriptFP16Export):
+    dtype = torch.bfloat16
+    supports_cpu = True
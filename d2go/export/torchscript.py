@@ -5,6 +5,7 @@
 import contextlib
 import logging
 import os
+import threading
 from typing import Tuple, Optional, Dict, NamedTuple, List, AnyStr, Set
 
 import torch
@@ -18,6 +19,10 @@ from torch.utils.mobile_optimizer import optimize_for_mobile
 
 logger = logging.getLogger(__name__)
 
+# patch_builtin_len mock-patches the module-level `len` of some detectron2 modules,
+# tracing from multiple threads must be serialized.
+_TRACING_LOCK = threading.Lock()
+
 
 class MobileOptimizationConfig(NamedTuple):
     # optimize_for_mobile
@@ -33,6 +38,7 @@ def trace_and_save_torchscript(
     output_path: str,
     mobile_optimization: Optional[MobileOptimizationConfig] = None,
     _extra_files: Optional[Dict[str, bytes]] = None,
+    save_for_lite_interpreter: bool = False,
 ):
     logger.info("Tracing and saving TorchScript to {} ...".format(output_path))
     PathManager.mkdirs(output_path)
@@ -43,7 +49,7 @@ def trace_and_save_torchscript(
     # dynamically registering the D2's version.
     from detectron2.export.torchscript_patch import patch_builtin_len
 
-    with torch.no_grad(), patch_builtin_len():
+    with _TRACING_LOCK, torch.no_grad(), patch_builtin_len():
         script_model = torch.jit.trace(model, inputs)
 
     with make_temp_directory("trace_and_save_torchscript") as tmp_dir:
@@ -58,6 +64,12 @@ def trace_and_save_torchscript(
         with _synced_local_file("model.jit") as model_file:
             torch.jit.save(script_model, model_file, _extra_files=_extra_files)
 
+        if save_for_lite_interpreter:
+            with _synced_local_file("model.ptl") as lite_path:
+                script_model._save_for_lite_interpreter(
+                    lite_path, _extra_files=_extra_files
+                )
+
         with _synced_local_file("data.pth") as data_file:
             torch.save(inputs, data_file)
 
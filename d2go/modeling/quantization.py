@@ -113,6 +113,10 @@ def add_quantization_default_configs(_C):
     _C.QUANTIZATION.PTQ.CALIBRATION_NUM_IMAGES = 1
     _C.QUANTIZATION.PTQ.CALIBRATION_FORCE_ON_GPU = False
 
+    # raise instead of warning when the FX converted model contains float ops
+    # sandwiched between dequantize and quantize nodes
+    _C.QUANTIZATION.STRICT_QDQ_AUDIT = False
+
     # deprecated
     _C.QUANTIZATION.SILICON_QAT = CfgNode()
     _C.QUANTIZATION.SILICON_QAT.ENABLED = False
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+
+
+import json
+import os
+import time
+import unittest
+from unittest import mock
+
+import d2go.export.api as api
+import torch
+from d2go.export.api import (
+    DefaultTorchscriptBF16Export,
+    DefaultTorchscriptFP16Export,
+    ModelExportMethodRegistry,
+    PredictorExportConfig,
+    _audit_quant_graph,
+    _force_fuse_residual_bn,
+    _get_first_batch,
+    _log_shared_inputs,
+    _quantized_engine,
+    _save_predictor_info,
+    default_export_predictor,
+)
+from mobile_cv.common.misc.file_utils import make_temp_directory
+
+
+@ModelExportMethodRegistry.register("_test_mock_export")
+class _MockExport(object):
+    calls = []
+
+    @classmethod
+    def export(cls, model, input_args, save_path, **export_kwargs):
+        if export_kwargs.get("fail", False):
+            raise ValueError(f"Failed to export {save_path}")
+        time.sleep(export_kwargs.get("delay", 0.0))
+        cls.calls.append((os.path.basename(save_path), input_args))
+        return {}
+
+
+class _MockExportModel(torch.nn.Module):
+    def __init__(self, **export_config_kwargs):
+        super().__init__()
+        self.export_config_kwargs = export_config_kwargs
+
+    def prepare_for_export(self, cfg, inputs, predictor_type):
+        return PredictorExportConfig(**self.export_config_kwargs)
+
+
+def _run_mock_export(model, data_loader=([torch.zeros(1)],)):
+    """Runs default_export_predictor, returns the kwargs used for PredictorInfo"""
+    _MockExport.calls.clear()
+    with make_temp_directory("test_mock_export") as tmp_dir, mock.patch(
+        "d2go.export.api._save_predictor_info"
+    ), mock.patch("d2go.export.api.PredictorInfo") as predictor_info_cls:
+        default_export_predictor(
+            None, model, "_test_mock_export", tmp_dir, data_loader
+        )
+    return predictor_info_cls.call_args[1]
+
+
+class _MapDataset(torch.utils.data.Dataset):
+    def __len__(self):
+        return 8
+
+    def __getitem__(self, idx):
+        return {"idx": idx, "image": torch.full((3, 4, 4), float(idx))}
+
+
+class _IterableDataset(torch.utils.data.IterableDataset):
+    def __iter__(self):
+        return (_MapDataset()[i] for i in range(len(_MapDataset())))
+
+
+class _FakePredictorInfo(object):
+    def __init__(self, data):
+        self.data = data
+
+    def to_dict(self):
+        return self.data
+
+
+def _create_small_model():
+    return torch.nn.Sequential(
+        torch.nn.Linear(4, 8),
+        torch.nn.ReLU(),
+        torch.nn.Linear(8, 2),
+    ).eval()
+
+
+class _SequentialWithCustomForward(torch.nn.Sequential):
+    def forward(self, x):
+        # children are not chained, BN runs on the input
+        return self[0](x) + self[1](x).sum()
+
+
+def _randomize_bn_stats(model):
+    for m in model.modules():
+        if isinstance(m, torch.nn.BatchNorm2d):
+            m.running_mean.uniform_(-1.0, 1.0)
+            m.running_var.uniform_(0.5, 2.0)
+            m.weight.data.uniform_(0.5, 2.0)
+            m.bias.data.uniform_(-1.0, 1.0)
+
+
+class TestForceFuseResidualBN(unittest.TestCase):
+    def test_fuse_conv_bn(self):
+        model = torch.nn.Sequential(
+            torch.nn.Conv2d(3, 4, kernel_size=3, padding=1),
+            torch.nn.BatchNorm2d(4),
+            torch.nn.ReLU(),
+        )
+        _randomize_bn_stats(model)
+        model.eval()
+        inputs = torch.rand(2, 3, 8, 8)
+        with torch.no_grad():
+            expected = model(inputs)
+            num_fused = _force_fuse_residual_bn(model)
+            outputs = model(inputs)
+
+        self.assertEqual(num_fused, 1)
+        self.assertIsInstance(model[1], torch.nn.Identity)
+        self.assertTrue(torch.allclose(outputs, expected, atol=1e-5))
+
+    def test_skip_non_foldable(self):
+        model = torch.nn.Sequential(
+            # custom forward, BN is not applied on the conv output
+            _SequentialWithCustomForward(
+                torch.nn.Conv2d(3, 3, kernel_size=1),
+                torch.nn.BatchNorm2d(3),
+            ),
+            # sub-module left in training mode
+            torch.nn.Sequential(
+                torch.nn.Conv2d(3, 4, kernel_size=1),
+                torch.nn.BatchNorm2d(4),
+            ),
+        )
+        _randomize_bn_stats(model)
+        model.eval()
+        model[1].train()
+        self.assertEqual(_force_fuse_residual_bn(model), 0)
+
+        self.assertIsInstance(model[0][1], torch.nn.BatchNorm2d)
+        self.assertIsInstance(model[1][1], torch.nn.BatchNorm2d)
+
+
+def _build_qdq_graph_module(float_op_between_qdq):
+    # quantize -> dequantize -> (sigmoid) -> quantize -> dequantize
+    graph = torch.fx.Graph()
+    x = graph.placeholder("x")
+    x = graph.call_function(torch.quantize_per_tensor, (x, 0.1, 0, torch.quint8))
+    x = graph.call_method("dequantize", (x,))
+    if float_op_between_qdq:
+        x = graph.call_function(torch.sigmoid, (x,))
+        x = graph.call_function(torch.quantize_per_tensor, (x, 0.1, 0, torch.quint8))
+        x = graph.call_method("dequantize", (x,))
+    graph.output(x)
+    return torch.fx.GraphModule(torch.nn.Module(), graph)
+
+
+class TestAuditQuantGraph(unittest.TestCase):
+    def test_no_violation(self):
+        model = _build_qdq_graph_module(float_op_between_qdq=False)
+        self.assertEqual(_audit_quant_graph(model, strict=True), [])
+
+    def test_float_op_between_qdq(self):
+        model = _build_qdq_graph_module(float_op_between_qdq=True)
+        with self.assertLogs("d2go.export.api", level="WARNING") as logs:
+            violations = _audit_quant_graph(model)
+        self.assertEqual(len(violations), 1)
+        self.assertIn("sigmoid", violations[0])
+        self.assertIn("sigmoid", "\n".join(logs.output))
+
+    def test_float_op_between_qdq_strict(self):
+        model = _build_qdq_graph_module(float_op_between_qdq=True)
+        with self.assertRaises(RuntimeError):
+            _audit_quant_graph(model, strict=True)
+
+
+class TestExportSubModels(unittest.TestCase):
+    def _create_model(self, parallel_export, model_export_kwargs):
+        names = list(model_export_kwargs.keys())
+        return _MockExportModel(
+            model={name: torch.nn.Identity() for name in names},
+            data_generator=lambda x: {name: (torch.zeros(1),) for name in names},
+            model_export_kwargs=model_export_kwargs,
+            parallel_export=parallel_export,
+        )
+
+    def _test_order(self, parallel_export):
+        # sub-models exported earlier finish later
+        model_export_kwargs = {
+            name: {"delay": 0.05 * (5 - i)} for i, name in enumerate("edcba")
+        }
+        model = self._create_model(parallel_export, model_export_kwargs)
+        predictor_info_kwargs = _run_mock_export(model)
+        self.assertEqual(list(predictor_info_kwargs["models"]), list("edcba"))
+        for name, model_info in predictor_info_kwargs["models"].items():
+            self.assertEqual(model_info.path, name)
+
+    def test_sequential_export_order(self):
+        self._test_order(parallel_export=False)
+
+    def test_parallel_export_order(self):
+        self._test_order(parallel_export=True)
+
+    def test_parallel_export_exception(self):
+        model_export_kwargs = {"a": {"delay": 0.05}, "b": {"fail": True}, "c": {}}
+        model = self._create_model(True, model_export_kwargs)
+        with self.assertRaisesRegex(ValueError, "Failed to export"):
+            _run_mock_export(model)
+
+
+class TestLogSharedInputs(unittest.TestCase):
+    def test_shared_inputs(self):
+        x = torch.zeros(4, 8)
+        model_inputs = {"a": (x,), "b": (x,), "c": (x[:2],)}
+        with self.assertLogs("d2go.export.api", level="INFO"):
+            total_bytes, unique_bytes = _log_shared_inputs(model_inputs)
+        self.assertEqual(total_bytes, 128 + 128 + 64)
+        self.assertEqual(unique_bytes, 128)
+
+    def test_copied_inputs(self):
+        x = torch.zeros(4, 8)
+        model_inputs = {"a": (x,), "b": (x.clone(),), "c": (x[:2].clone(),)}
+        with self.assertLogs("d2go.export.api", level="INFO"):
+            total_bytes, unique_bytes = _log_shared_inputs(model_inputs)
+        self.assertEqual(total_bytes, 128 + 128 + 64)
+        self.assertEqual(unique_bytes, 128 + 128 + 64)
+
+    def test_skipped_without_info_logging(self):
+        model_inputs = {"a": (torch.zeros(4, 8),)}
+        with mock.patch("d2go.export.api.logger.isEnabledFor", return_value=False):
+            self.assertIsNone(_log_shared_inputs(model_inputs))
+
+
+class TestQuantizedEngine(unittest.TestCase):
+    def setUp(self):
+        self.engines = [
+            x for x in torch.backends.quantized.supported_engines if x != "none"
+        ]
+        if len(self.engines) < 2:
+            self.skipTest("Requires at least two quantized engines")
+        self.prev_engine = torch.backends.quantized.engine
+        torch.backends.quantized.engine = self.engines[0]
+
+    def tearDown(self):
+        torch.backends.quantized.engine = self.prev_engine
+
+    def test_engine_kept_after_success(self):
+        with _quantized_engine(self.engines[1]):
+            self.assertEqual(torch.backends.quantized.engine, self.engines[1])
+        self.assertEqual(torch.backends.quantized.engine, self.engines[1])
+
+    def test_engine_restored_on_exception(self):
+        with self.assertRaises(ValueError):
+            with _quantized_engine(self.engines[1]):
+                raise ValueError()
+        self.assertEqual(torch.backends.quantized.engine, self.engines[0])
+
+    def test_unsupported_engine(self):
+        with self.assertRaises(AssertionError):
+            with _quantized_engine("unsupported_engine"):
+                pass
+        self.assertEqual(torch.backends.quantized.engine, self.engines[0])
+
+
+class TestGetFirstBatch(unittest.TestCase):
+    def _assert_batch_equal(self, batch, expected):
+        self.assertEqual(batch.keys(), expected.keys())
+        for k in expected:
+            self.assertTrue(torch.equal(torch.as_tensor(batch[k]), expected[k]))
+
+    def _test_first_batch(self, data_loader):
+        expected = next(iter(data_loader))
+        self._assert_batch_equal(_get_first_batch(data_loader), expected)
+
+    def test_map_dataset_with_workers(self):
+        data_loader = torch.utils.data.DataLoader(
+            _MapDataset(), batch_size=2, num_workers=2
+        )
+        with mock.patch.object(
+            torch.utils.data.DataLoader, "__iter__", side_effect=RuntimeError
+        ):
+            batch = _get_first_batch(data_loader)
+        # samples are loaded in main process, without iterating the data loader
+        self._assert_batch_equal(batch, next(iter(data_loader)))
+
+    def test_map_dataset_with_collate_fn(self):
+        data_loader = torch.utils.data.DataLoader(
+            _MapDataset(), batch_size=3, num_workers=2, collate_fn=lambda x: x
+        )
+        batch = _get_first_batch(data_loader)
+        self.assertEqual([x["idx"] for x in batch], [0, 1, 2])
+
+    def test_map_dataset_without_workers(self):
+        data_loader = torch.utils.data.DataLoader(_MapDataset(), batch_size=2)
+        self._test_first_batch(data_loader)
+
+    def test_iterable_dataset(self):
+        data_loader = torch.utils.data.DataLoader(
+            _IterableDataset(), batch_size=2, num_workers=1
+        )
+        self._test_first_batch(data_loader)
+
+    def test_no_auto_batching(self):
+        data_loader = torch.utils.data.DataLoader(
+            _MapDataset(), batch_size=None, num_workers=2
+        )
+        self.assertIsNone(data_loader.batch_sampler)
+        self._test_first_batch(data_loader)
+
+    def test_non_data_loader(self):
+        self.assertEqual(_get_first_batch([[1, 2], [3, 4]]), [1, 2])
+
+
+class TestSavePredictorInfo(unittest.TestCase):
+    DATA = {
+        "model": {"path": ".", "type": "torchscript"},
+        "preprocess_info": {"name": "IdentityPreprocess", "params": {"a": [1, 2.5]}},
+    }
+
+    def _save_and_load(self, data):
+        with make_temp_directory("test_save_predictor_info") as tmp_dir:
+            json_path = os.path.join(tmp_dir, "predictor_info.json")
+            _save_predictor_info(_FakePredictorInfo(data), json_path)
+            with open(json_path, "r") as f:
+                content = f.read()
+        return content, json.loads(content)
+
+    def _test_round_trip(self):
+        content, loaded = self._save_and_load(self.DATA)
+        self.assertEqual(loaded, self.DATA)
+        return content
+
+    @unittest.skipIf(api.orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        orjson_content = self._test_round_trip()
+        with mock.patch("d2go.export.api.orjson", None):
+            json_content = self._test_round_trip()
+        # the file has the same format with or without orjson
+        self.assertEqual(orjson_content, json_content)
+
+    @unittest.skipIf(api.orjson is None, "orjson is not installed")
+    def test_orjson_non_str_keys(self):
+        _, loaded = self._save_and_load({"params": {1: 2}})
+        self.assertEqual(loaded, {"params": {"1": 2}})
+
+    def test_json(self):
+        with mock.patch("d2go.export.api.orjson", None):
+            self._test_round_trip()
+
+    def test_fallback_to_json(self):
+        fake_orjson = mock.MagicMock()
+        fake_orjson.dumps.side_effect = TypeError("Type is not JSON serializable")
+        with mock.patch("d2go.export.api.orjson", fake_orjson):
+            self._test_round_trip()
+        fake_orjson.dumps.assert_called_once()
+
+
+class TestDataGeneratorRequired(unittest.TestCase):
+    def test_data_generator_called(self):
+        data_generator = mock.MagicMock(return_value=(torch.ones(2),))
+        model = _MockExportModel(
+            model=torch.nn.Identity(), data_generator=data_generator
+        )
+        _run_mock_export(model)
+        data_generator.assert_called_once()
+        self.assertEqual(len(_MockExport.calls), 1)
+        self.assertTrue(torch.equal(_MockExport.calls[0][1][0], torch.ones(2)))
+
+    def test_data_generator_not_required(self):
+        data_generator = mock.MagicMock(return_value=(torch.ones(2),))
+        model = _MockExportModel(
+            model={"a": torch.nn.Identity(), "b": torch.nn.Identity()},
+            data_generator=data_generator,
+            data_generator_required=False,
+        )
+        _run_mock_export(model)
+        data_generator.assert_not_called()
+        self.assertEqual(sorted(_MockExport.calls), [("a", None), ("b", None)])
+
+
+class TestTorchscriptLowPrecisionExport(unittest.TestCase):
+    def _test_export(self, export_cls, atol, device="cpu"):
+        model = _create_small_model().to(device)
+        inputs = (torch.rand(3, 4, device=device),)
+
+        with make_temp_directory("test_low_precision_export") as tmp_dir:
+            export_cls.export(model, inputs, tmp_dir)
+            script_model = torch.jit.load(os.path.join(tmp_dir, "model.jit"))
+            outputs = script_model(*inputs)
+
+        # the exported model keeps the FP32 interface, the input model is untouched
+        self.assertEqual(outputs.dtype, torch.float32)
+        for param in model.parameters():
+            self.assertEqual(param.dtype, torch.float32)
+        with torch.no_grad():
+            expected = model(*inputs)
+        self.assertTrue(torch.allclose(outputs, expected, atol=atol))
+
+    @unittest.skipIf(not torch.cuda.is_available(), "FP16 export requires CUDA")
+    def test_export_fp16(self):
+        self._test_export(DefaultTorchscriptFP16Export, atol=1e-2, device="cuda")
+
+    def test_export_fp16_on_cpu(self):
+        model = torch.nn.Sequential(
+            torch.nn.Conv2d(3, 4, kernel_size=3),
+            torch.nn.ReLU(),
+        ).eval()
+        inputs = (torch.rand(1, 3, 8, 8),)
+        with make_temp_directory("test_low_precision_export") as tmp_dir:
+            with self.assertRaisesRegex(ValueError, "torchscript_bf16"):
+                DefaultTorchscriptFP16Export.export(model, inputs, tmp_dir)
+
+    def test_export_bf16(self):
+        self._test_export(DefaultTorchscriptBF16Export, atol=5e-2)
+
+
+if __name__ == "__main__":
+    unittest.main()
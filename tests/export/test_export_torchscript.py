@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+
+
+import os
+import unittest
+
+import torch
+from d2go.export.torchscript import trace_and_save_torchscript
+from mobile_cv.common.misc.file_utils import make_temp_directory
+from torch.jit.mobile import _load_for_lite_interpreter
+
+
+class TestTraceAndSaveTorchscript(unittest.TestCase):
+    def _create_model(self):
+        return torch.nn.Sequential(
+            torch.nn.Conv2d(3, 4, kernel_size=3),
+            torch.nn.ReLU(),
+        ).eval()
+
+    def test_save_for_lite_interpreter(self):
+        model = self._create_model()
+        inputs = (torch.rand(1, 3, 8, 8),)
+        with make_temp_directory("test_save_for_lite_interpreter") as tmp_dir:
+            trace_and_save_torchscript(
+                model, inputs, tmp_dir, save_for_lite_interpreter=True
+            )
+            lite_model = _load_for_lite_interpreter(os.path.join(tmp_dir, "model.ptl"))
+            outputs = lite_model(*inputs)
+
+        with torch.no_grad():
+            expected = model(*inputs)
+        self.assertTrue(torch.allclose(outputs, expected))
+
+    def test_no_lite_interpreter_by_default(self):
+        model = self._create_model()
+        inputs = (torch.rand(1, 3, 8, 8),)
+        with make_temp_directory("test_save_for_lite_interpreter") as tmp_dir:
+            trace_and_save_torchscript(model, inputs, tmp_dir)
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "model.jit")))
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, "model.ptl")))
+
+
+if __name__ == "__main__":
+    unittest.main()